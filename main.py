@@ -1,14 +1,26 @@
 
 import pygame
 import sys
-from snake_game import SnakeGame, Direction, GameState
+import argparse
+from snake_game import SnakeGame, Direction, GameState, is_grid_aligned
+
+# 命令行参数
+parser = argparse.ArgumentParser(description='贪吃蛇')
+parser.add_argument('--width', type=int, default=600, help='窗口宽度 (像素)')
+parser.add_argument('--height', type=int, default=400, help='窗口高度 (像素)')
+parser.add_argument('--block', type=int, default=10, help='格子大小 (像素)')
+# 大棋盘渲染模式: 按格子维护像素数组, 每帧只更新变化的格子并整屏缩放 blit (需要 numpy)
+parser.add_argument('--blit', action='store_true', help='使用数组 blit 渲染大棋盘')
+args, _ = parser.parse_known_args()
+if args.blit and not is_grid_aligned(args.width, args.height, args.block):
+    parser.error('--blit 模式下 --width 和 --height 必须是 2 * --block 的整数倍')
 
 # 初始化 Pygame
 pygame.init()
 
 # 屏幕尺寸
-screen_width = 600
-screen_height = 400
+screen_width = args.width
+screen_height = args.height
 screen = pygame.display.set_mode((screen_width, screen_height))
 pygame.display.set_caption('贪吃蛇')
 
@@ -19,9 +31,11 @@ red = (213, 50, 80)
 green = (0, 255, 0)
 
 # 蛇和食物的尺寸
-snake_block = 10
+snake_block = args.block
 snake_speed = 15
 
+use_array_blit = args.blit
+
 # 字体
 font_style = pygame.font.SysFont(None, 50)
 
@@ -30,6 +44,71 @@ def draw_snake(snake_block, snake_positions):
     for pos in snake_positions:
         pygame.draw.rect(screen, black, [pos[0], pos[1], snake_block, snake_block])
 
+class GridRenderer:
+    """Render the game through a cell-resolution surface scaled to the screen"""
+
+    def __init__(self, game):
+        # 每个格子对应一个像素, 棋盘和蛇的起点都必须落在格子上
+        if not is_grid_aligned(game.width, game.height, game.block_size):
+            raise ValueError('board width and height must be multiples of 2 * block_size')
+        self.game = game
+        self.cols = game.width // game.block_size
+        self.rows = game.height // game.block_size
+        self.cells = pygame.Surface((self.cols, self.rows), 0, screen)
+        # 缩放到棋盘所在的区域
+        self.target = screen.subsurface((0, 0, game.width, game.height))
+        screen.fill(white)
+        self.full_redraw()
+
+    def _cell(self, pos):
+        return pos[0] // self.game.block_size, pos[1] // self.game.block_size
+
+    def full_redraw(self):
+        """Repaint every cell from the current game state"""
+        pixels = pygame.surfarray.pixels3d(self.cells)
+        pixels[:, :] = white
+        food = self._cell(self.game.get_food_position())
+        pixels[food] = green
+        for pos in self.game.snake_positions:
+            pixels[self._cell(pos)] = black
+        del pixels  # 解锁 surface
+
+        self.head = self.game.get_snake_head()
+        self.tail = self.game.snake_positions[-1]
+        self.length = self.game.get_snake_length()
+        self.food = self.game.get_food_position()
+
+    def sync(self):
+        """Repaint only the cells that changed since the last call"""
+        game = self.game
+        length = game.get_snake_length()
+        if length not in (self.length, self.length + 1):
+            self.full_redraw()
+            return
+        head = game.get_snake_head()
+        food = game.get_food_position()
+        if head == self.head and food == self.food:
+            return
+
+        pixels = pygame.surfarray.pixels3d(self.cells)
+        if length == self.length:
+            pixels[self._cell(self.tail)] = white
+        if food != self.food:
+            pixels[self._cell(self.food)] = white
+        pixels[self._cell(head)] = black
+        pixels[self._cell(food)] = green
+        del pixels  # 解锁 surface
+
+        self.head = head
+        self.tail = game.snake_positions[-1]
+        self.length = length
+        self.food = food
+
+    def draw(self):
+        """Scale the cell surface onto the screen in a single blit"""
+        self.sync()
+        pygame.transform.scale(self.cells, self.target.get_size(), self.target)
+
 def show_message(msg, color):
     """Display a message on the screen"""
     mesg = font_style.render(msg, True, color)
@@ -40,6 +119,7 @@ def game_loop():
     # Create game instance
     game = SnakeGame(width=screen_width, height=screen_height, block_size=snake_block)
     clock = pygame.time.Clock()
+    renderer = GridRenderer(game) if use_array_blit else None
 
     while True:
         # Handle game over state
@@ -78,14 +158,17 @@ def game_loop():
         game.update()
         
         # Draw everything
-        screen.fill(white)
-        
-        # Draw food
-        food_pos = game.get_food_position()
-        pygame.draw.rect(screen, green, [food_pos[0], food_pos[1], snake_block, snake_block])
-        
-        # Draw snake
-        draw_snake(snake_block, game.get_snake_body())
+        if renderer is not None:
+            renderer.draw()
+        else:
+            screen.fill(white)
+
+            # Draw food
+            food_pos = game.get_food_position()
+            pygame.draw.rect(screen, green, [food_pos[0], food_pos[1], snake_block, snake_block])
+
+            # Draw snake
+            draw_snake(snake_block, game.get_snake_body())
 
         pygame.display.update()
         clock.tick(snake_speed)
@@ -0,0 +1,331 @@
+"""
+Snake Dataset Pipeline
+Stream (observation, action, reward, done) transitions from headless
+SnakeGame runs into fixed-size NumPy shards, and read them back as
+shuffled mini-batches through memory maps
+"""
+import os
+import glob
+import random
+import collections
+import multiprocessing
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from snake_game import SnakeGame, Direction, is_grid_aligned
+
+
+# Cell values used in encoded observations
+EMPTY = 0
+BODY = 1
+HEAD = 2
+FOOD = 3
+
+# Action index <-> Direction mapping
+ACTIONS = list(Direction)
+ACTION_INDEX = {direction: index for index, direction in enumerate(ACTIONS)}
+
+# Rewards
+FOOD_REWARD = 1.0
+DEATH_REWARD = -1.0
+
+FIELDS = ("obs", "action", "reward", "done")
+
+Transition = Tuple[np.ndarray, int, float, bool]
+Policy = Callable[[SnakeGame], Direction]
+
+
+def encode_observation(game: SnakeGame) -> np.ndarray:
+    """Encode the game board as a (rows, cols) uint8 grid of cell values"""
+    rows = game.height // game.block_size
+    cols = game.width // game.block_size
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    food_x, food_y = game.get_food_position()
+    grid[food_y // game.block_size, food_x // game.block_size] = FOOD
+    for x, y in game.snake_positions[1:]:
+        grid[y // game.block_size, x // game.block_size] = BODY
+    head_x, head_y = game.get_snake_head()
+    grid[head_y // game.block_size, head_x // game.block_size] = HEAD
+    return grid
+
+
+def greedy_autopilot(game: SnakeGame) -> Direction:
+    """Head towards the food, preferring moves that don't collide immediately"""
+    head_x, head_y = game.get_snake_head()
+    food_x, food_y = game.get_food_position()
+    body = set(game.snake_positions[:-1])
+
+    def is_safe(direction: Direction) -> bool:
+        dx, dy = direction.value
+        x = head_x + dx * game.block_size
+        y = head_y + dy * game.block_size
+        return 0 <= x < game.width and 0 <= y < game.height and (x, y) not in body
+
+    def distance(direction: Direction) -> int:
+        dx, dy = direction.value
+        x = head_x + dx * game.block_size
+        y = head_y + dy * game.block_size
+        return abs(food_x - x) + abs(food_y - y)
+
+    candidates = sorted(ACTIONS, key=distance)
+    for direction in candidates:
+        if is_safe(direction):
+            return direction
+    return game.direction
+
+
+def _check_board(width: int, height: int, block_size: int):
+    """Reject boards whose cells don't line up with the snake's moves"""
+    if not is_grid_aligned(width, height, block_size):
+        raise ValueError(
+            f"width and height must be multiples of 2 * block_size "
+            f"(got {width}x{height} with block_size={block_size})")
+
+
+def play_game(policy: Policy, width: int = 600, height: int = 400,
+              block_size: int = 10, max_steps: int = 1000,
+              seed: Optional[int] = None) -> Iterator[Transition]:
+    """
+    Play one headless game and yield its transitions one step at a time.
+
+    With a seed, the game draws food from its own random.Random and the global
+    random module is left as it was. The last transition has done=True both
+    on death and when the game is cut off at max_steps.
+    """
+    _check_board(width, height, block_size)
+    rng = random.Random(seed) if seed is not None else None
+    game = SnakeGame(width=width, height=height, block_size=block_size, rng=rng)
+
+    for step in range(max_steps):
+        obs = encode_observation(game)
+        game.change_direction(policy(game))
+        previous_score = game.get_score()
+        game.update()
+
+        if game.is_game_over():
+            reward = DEATH_REWARD
+        else:
+            reward = (game.get_score() - previous_score) * FOOD_REWARD
+        done = game.is_game_over() or step == max_steps - 1
+        yield obs, ACTION_INDEX[game.direction], reward, done
+        if done:
+            return
+
+
+def _play_game_arrays(args: tuple) -> Dict[str, np.ndarray]:
+    """Worker entry point: play a whole game and return it as stacked arrays"""
+    policy, width, height, block_size, max_steps, seed = args
+    transitions = list(play_game(policy, width, height, block_size,
+                                 max_steps, seed))
+    if not transitions:
+        shape = (0, height // block_size, width // block_size)
+        return {
+            "obs": np.empty(shape, dtype=np.uint8),
+            "action": np.empty(0, dtype=np.int8),
+            "reward": np.empty(0, dtype=np.float32),
+            "done": np.empty(0, dtype=np.bool_),
+        }
+    obs, actions, rewards, dones = zip(*transitions)
+    return {
+        "obs": np.stack(obs),
+        "action": np.asarray(actions, dtype=np.int8),
+        "reward": np.asarray(rewards, dtype=np.float32),
+        "done": np.asarray(dones, dtype=np.bool_),
+    }
+
+
+def _bounded_imap(pool, func: Callable, tasks: Iterable,
+                  window: int) -> Iterator:
+    """
+    Like pool.imap, but with at most window tasks submitted and not yet
+    consumed, so finished results can't pile up ahead of a slow consumer.
+    """
+    pending = collections.deque()
+    for task in tasks:
+        if len(pending) == window:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (task,)))
+    while pending:
+        yield pending.popleft().get()
+
+
+def generate_transitions(policy: Policy = greedy_autopilot, num_games: int = 1,
+                         width: int = 600, height: int = 400,
+                         block_size: int = 10, max_steps: int = 1000,
+                         seed: int = 0,
+                         processes: int = 1) -> Iterator[Transition]:
+    """
+    Yield transitions from num_games games, game i being seeded with seed + i.
+
+    With processes > 1 the games are played in a worker pool (the policy must
+    then be picklable, e.g. a module-level function). At most `processes`
+    games are held at any time, counting those still being played, those
+    finished and waiting, and the one currently being yielded.
+    """
+    _check_board(width, height, block_size)
+    tasks = ((policy, width, height, block_size, max_steps, seed + i)
+             for i in range(num_games))
+
+    if processes <= 1:
+        for task in tasks:
+            yield from play_game(*task)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for game in _bounded_imap(pool, _play_game_arrays, tasks, processes):
+            for i in range(len(game["action"])):
+                yield (game["obs"][i], int(game["action"][i]),
+                       float(game["reward"][i]), bool(game["done"][i]))
+
+
+class ShardWriter:
+    """
+    Buffer transitions and flush them to fixed-size .npy shards.
+
+    Shards are written under partial_* names and only renamed to shard_* by
+    close(), so a run that fails part way leaves no shards that look complete.
+    """
+
+    def __init__(self, out_dir: str, shard_size: int = 100000):
+        if shard_size <= 0:
+            raise ValueError("shard_size must be positive")
+        if glob.glob(os.path.join(out_dir, "shard_*_*.npy")):
+            raise FileExistsError(f"{out_dir} already contains shards")
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        self.shard_paths: List[str] = []
+        self.total = 0
+        self._partial_paths: List[str] = []
+        self._buffers: Optional[Dict[str, np.ndarray]] = None
+        self._count = 0
+        os.makedirs(out_dir, exist_ok=True)
+        # Leftovers from an aborted run
+        for path in glob.glob(os.path.join(out_dir, "partial_shard_*_*.npy")):
+            os.remove(path)
+
+    def _allocate(self, obs: np.ndarray):
+        """Preallocate buffers once the observation shape is known"""
+        self._buffers = {
+            "obs": np.empty((self.shard_size,) + obs.shape, dtype=np.uint8),
+            "action": np.empty(self.shard_size, dtype=np.int8),
+            "reward": np.empty(self.shard_size, dtype=np.float32),
+            "done": np.empty(self.shard_size, dtype=np.bool_),
+        }
+
+    def add(self, obs: np.ndarray, action: int, reward: float, done: bool):
+        """Append one transition, flushing a shard when the buffer is full"""
+        if self._buffers is None:
+            self._allocate(obs)
+        i = self._count
+        self._buffers["obs"][i] = obs
+        self._buffers["action"][i] = action
+        self._buffers["reward"][i] = reward
+        self._buffers["done"][i] = done
+        self._count += 1
+        if self._count == self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered transitions (if any) to the next shard"""
+        if self._count == 0:
+            return
+        index = len(self._partial_paths)
+        prefix = os.path.join(self.out_dir, f"partial_shard_{index:05d}")
+        for field in FIELDS:
+            np.save(f"{prefix}_{field}.npy", self._buffers[field][:self._count])
+        self._partial_paths.append(prefix)
+        self.total += self._count
+        self._count = 0
+
+    def close(self):
+        """Flush the final partial shard and publish all shards"""
+        self.flush()
+        for index, partial in enumerate(self._partial_paths):
+            prefix = os.path.join(self.out_dir, f"shard_{index:05d}")
+            for field in FIELDS:
+                os.replace(f"{partial}_{field}.npy", f"{prefix}_{field}.npy")
+            self.shard_paths.append(prefix)
+        self._partial_paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # On error, leave the partial_* files behind instead of publishing them
+        if exc_type is None:
+            self.close()
+
+
+def write_dataset(transitions: Iterable[Transition], out_dir: str,
+                  shard_size: int = 100000) -> List[str]:
+    """Stream transitions into shards under out_dir and return the shard prefixes"""
+    with ShardWriter(out_dir, shard_size) as writer:
+        for obs, action, reward, done in transitions:
+            writer.add(obs, action, reward, done)
+    return writer.shard_paths
+
+
+def list_shards(data_dir: str) -> List[str]:
+    """Return the shard prefixes found in data_dir, in write order"""
+    paths = sorted(glob.glob(os.path.join(data_dir, "shard_*_obs.npy")))
+    return [path[:-len("_obs.npy")] for path in paths]
+
+
+def load_shard(prefix: str) -> Dict[str, np.ndarray]:
+    """Open one shard as read-only memory-mapped arrays"""
+    return {field: np.load(f"{prefix}_{field}.npy", mmap_mode="r")
+            for field in FIELDS}
+
+
+def iter_batches(data_dir: str, batch_size: int = 256, shuffle: bool = True,
+                 seed: Optional[int] = None,
+                 drop_last: bool = False) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield mini-batches (dicts keyed by field) from the shards in data_dir.
+
+    Shards are memory-mapped and only the rows of the current batch are read.
+    With shuffle, both the shard order and the row order within each shard
+    are permuted; leftover rows are carried into the next shard's batches.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    rng = np.random.default_rng(seed)
+    shards = list_shards(data_dir)
+    if shuffle:
+        shards = [shards[i] for i in rng.permutation(len(shards))]
+
+    pending: List[Dict[str, np.ndarray]] = []
+    pending_count = 0
+    for prefix in shards:
+        shard = load_shard(prefix)
+        size = len(shard["action"])
+        order = rng.permutation(size) if shuffle else np.arange(size)
+
+        for start in range(0, size, batch_size):
+            # Sorted indices keep the memory-mapped reads mostly sequential
+            rows = np.sort(order[start:start + batch_size])
+            chunk = {field: np.asarray(shard[field][rows]) for field in FIELDS}
+            if shuffle:
+                mix = rng.permutation(len(rows))
+                chunk = {field: chunk[field][mix] for field in FIELDS}
+            pending.append(chunk)
+            pending_count += len(rows)
+
+            if pending_count >= batch_size:
+                batch = _concat(pending)
+                yield {field: batch[field][:batch_size] for field in FIELDS}
+                rest = {field: batch[field][batch_size:] for field in FIELDS}
+                pending_count -= batch_size
+                pending = [rest] if pending_count else []
+
+    if pending_count and not drop_last:
+        yield _concat(pending)
+
+
+def _concat(chunks: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate batch chunks field by field"""
+    if len(chunks) == 1:
+        return chunks[0]
+    return {field: np.concatenate([chunk[field] for chunk in chunks])
+            for field in FIELDS}
@@ -19,13 +19,21 @@ class GameState(Enum):
     GAME_OVER = "game_over"
 
 
+def is_grid_aligned(width: int, height: int, block_size: int) -> bool:
+    """Check the board is a whole number of cells and the start cell sits on the grid"""
+    return width % (2 * block_size) == 0 and height % (2 * block_size) == 0
+
+
 class SnakeGame:
     """Core Snake Game Logic"""
     
-    def __init__(self, width: int = 600, height: int = 400, block_size: int = 10):
+    def __init__(self, width: int = 600, height: int = 400, block_size: int = 10,
+                 rng: Optional[random.Random] = None):
         self.width = width
         self.height = height
         self.block_size = block_size
+        # Source of food positions; defaults to the global random module
+        self.rng = rng if rng is not None else random
         self.reset_game()
     
     def reset_game(self):
@@ -39,8 +47,8 @@ class SnakeGame:
     def _generate_food(self) -> Tuple[int, int]:
         """Generate food at a random position not occupied by snake"""
         while True:
-            x = random.randrange(0, self.width // self.block_size) * self.block_size
-            y = random.randrange(0, self.height // self.block_size) * self.block_size
+            x = self.rng.randrange(0, self.width // self.block_size) * self.block_size
+            y = self.rng.randrange(0, self.height // self.block_size) * self.block_size
             food_pos = (x, y)
             if food_pos not in self.snake_positions:
                 return food_pos
@@ -0,0 +1,102 @@
+"""
+Rendering Tests for the Array-Blit Renderer
+Compare GridRenderer frames against the per-rect renderer on a dummy display
+"""
+import unittest
+import random
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+try:
+    import numpy
+    import pygame
+    import main
+except ImportError:  # pygame or numpy not installed
+    main = None
+
+from snake_game import SnakeGame, Direction
+
+
+def toward_food(game):
+    """Simple policy steering the head towards the food"""
+    head_x, head_y = game.get_snake_head()
+    food_x, food_y = game.get_food_position()
+    if food_x != head_x:
+        return Direction.RIGHT if food_x > head_x else Direction.LEFT
+    return Direction.DOWN if food_y > head_y else Direction.UP
+
+
+@unittest.skipIf(main is None, "pygame or numpy is not installed")
+class TestGridRenderer(unittest.TestCase):
+
+    def set_screen(self, width, height):
+        """Point main's drawing functions at a screen of the given size"""
+        main.screen = pygame.display.set_mode((width, height))
+
+    def rect_frame(self, game):
+        """Render a frame with the default per-rect path and return its pixels"""
+        main.screen.fill(main.white)
+        food_x, food_y = game.get_food_position()
+        pygame.draw.rect(main.screen, main.green,
+                         [food_x, food_y, game.block_size, game.block_size])
+        main.draw_snake(game.block_size, game.get_snake_body())
+        return pygame.image.tobytes(main.screen, 'RGB')
+
+    def blit_frame(self, renderer):
+        """Render a frame with the array-blit path and return its pixels"""
+        renderer.draw()
+        return pygame.image.tobytes(main.screen, 'RGB')
+
+    def play_and_compare(self, width, height, block_size, steps=300):
+        """Play a game, comparing both renderers after every tick"""
+        self.set_screen(width, height)
+        game = SnakeGame(width=width, height=height, block_size=block_size,
+                         rng=random.Random(0))
+        renderer = main.GridRenderer(game)
+        policy = random.Random(1)
+
+        for step in range(steps):
+            if step % 5 == 0:
+                game.change_direction(policy.choice(list(Direction)))
+            else:
+                game.change_direction(toward_food(game))
+            game.update()
+            if game.is_game_over():
+                # Reset exercises the full-redraw path
+                game.reset_game()
+            self.assertEqual(self.blit_frame(renderer), self.rect_frame(game),
+                             f"frame {step} differs")
+        return game
+
+    def test_matches_rect_renderer(self):
+        """Test blit frames match the rect renderer tick by tick"""
+        for width, height, block_size in [(600, 400, 10), (60, 40, 10), (84, 60, 3)]:
+            with self.subTest(size=(width, height, block_size)):
+                self.play_and_compare(width, height, block_size)
+
+    def test_matches_rect_renderer_while_growing(self):
+        """Test blit frames stay in sync while the snake eats food"""
+        self.set_screen(200, 200)
+        game = SnakeGame(width=200, height=200, block_size=10, rng=random.Random(2))
+        renderer = main.GridRenderer(game)
+
+        for _ in range(5):
+            head_x, head_y = game.get_snake_head()
+            game.food_position = (head_x + 10, head_y)
+            game.update()
+            self.assertEqual(self.blit_frame(renderer), self.rect_frame(game))
+        self.assertEqual(game.get_snake_length(), 6)
+
+    def test_rejects_misaligned_board(self):
+        """Test boards that don't line up with the cell grid are rejected"""
+        for width, height, block_size in [(65, 40, 10), (80, 60, 3), (100, 100, 20)]:
+            self.set_screen(width, height)
+            game = SnakeGame(width=width, height=height, block_size=block_size)
+            with self.assertRaises(ValueError):
+                main.GridRenderer(game)
+
+
+if __name__ == '__main__':
+    unittest.main()
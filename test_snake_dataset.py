@@ -0,0 +1,217 @@
+"""
+Unit Tests for Snake Dataset Pipeline
+"""
+import unittest
+import tempfile
+import random
+import os
+
+try:
+    import numpy as np
+    import snake_dataset
+    from snake_dataset import (
+        encode_observation, play_game, generate_transitions, greedy_autopilot,
+        write_dataset, list_shards, load_shard, iter_batches, ShardWriter,
+        HEAD, BODY, FOOD, DEATH_REWARD
+    )
+except ImportError:  # numpy not installed
+    np = None
+
+from snake_game import SnakeGame, Direction
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSnakeDataset(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary output directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encode_observation(self):
+        """Test board encoding marks head, body and food cells"""
+        game = SnakeGame(width=50, height=30, block_size=10)
+        game.snake_positions = [(20, 10), (10, 10)]
+        game.food_position = (40, 20)
+        grid = encode_observation(game)
+
+        self.assertEqual(grid.shape, (3, 5))
+        self.assertEqual(grid[1, 2], HEAD)
+        self.assertEqual(grid[1, 1], BODY)
+        self.assertEqual(grid[2, 4], FOOD)
+        self.assertEqual(int((grid != 0).sum()), 3)
+
+    def test_play_game_ends_with_death(self):
+        """Test a game that runs into the wall ends with a done transition"""
+        def always_right(game):
+            return Direction.RIGHT
+
+        transitions = list(play_game(always_right, width=60, height=60,
+                                     block_size=10, max_steps=100, seed=1))
+
+        *_, (obs, action, reward, done) = transitions
+        self.assertTrue(done)
+        self.assertEqual(reward, DEATH_REWARD)
+        self.assertEqual(action, snake_dataset.ACTION_INDEX[Direction.RIGHT])
+        self.assertFalse(any(t[3] for t in transitions[:-1]))
+
+    def test_play_game_rejects_misaligned_board(self):
+        """Test boards whose cells don't line up with the grid are rejected"""
+        for width, height in [(65, 40), (50, 50), (60, 30)]:
+            with self.assertRaises(ValueError):
+                next(play_game(greedy_autopilot, width=width, height=height,
+                               block_size=10))
+            with self.assertRaises(ValueError):
+                next(generate_transitions(greedy_autopilot, width=width,
+                                          height=height, block_size=10))
+
+    def test_play_game_marks_truncation_as_done(self):
+        """Test a game cut off at max_steps ends with a done transition"""
+        transitions = list(play_game(greedy_autopilot, width=100, height=100,
+                                     block_size=10, max_steps=3, seed=1))
+
+        self.assertEqual([t[3] for t in transitions], [False, False, True])
+        self.assertNotEqual(transitions[-1][2], DEATH_REWARD)
+
+    def test_play_game_leaves_global_random_untouched(self):
+        """Test seeded games don't reset the caller's random state"""
+        random.seed(123)
+        expected = [random.random() for _ in range(3)]
+
+        random.seed(123)
+        games = [play_game(greedy_autopilot, width=60, height=60,
+                           block_size=10, max_steps=20, seed=seed)
+                 for seed in (0, 1)]
+        first = random.random()
+        for game in games:
+            list(game)
+        self.assertEqual([first, random.random(), random.random()], expected)
+
+    def test_generate_transitions_is_reproducible(self):
+        """Test the same seed produces the same transitions"""
+        kwargs = dict(num_games=2, width=60, height=60, block_size=10,
+                      max_steps=50, seed=7)
+        first = list(generate_transitions(greedy_autopilot, **kwargs))
+        second = list(generate_transitions(greedy_autopilot, **kwargs))
+
+        self.assertEqual(len(first), len(second))
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a[0], b[0])
+            self.assertEqual(a[1:], b[1:])
+
+    def test_worker_processes_match_single_process(self):
+        """Test the worker pool yields the same transitions in the same order"""
+        kwargs = dict(num_games=3, width=60, height=60, block_size=10,
+                      max_steps=30, seed=3)
+        serial = list(generate_transitions(greedy_autopilot, **kwargs))
+        pooled = list(generate_transitions(greedy_autopilot, processes=2, **kwargs))
+
+        self.assertEqual(len(serial), len(pooled))
+        for a, b in zip(serial, pooled):
+            np.testing.assert_array_equal(a[0], b[0])
+            self.assertEqual(a[1:], b[1:])
+
+    def test_worker_processes_with_empty_games(self):
+        """Test the worker pool handles games that yield no transitions"""
+        transitions = list(generate_transitions(greedy_autopilot, num_games=3,
+                                                max_steps=0, processes=2))
+        self.assertEqual(transitions, [])
+
+    def test_bounded_imap_limits_buffered_games(self):
+        """Test no more than window results are held ahead of the consumer"""
+        window = 2
+        outstanding = []
+
+        class FakeResult:
+            def __init__(self, value):
+                self.value = value
+
+            def get(self):
+                return self.value
+
+        class FakePool:
+            def apply_async(self, func, args):
+                outstanding.append(args[0])
+                return FakeResult(func(*args))
+
+        results = []
+        for value in snake_dataset._bounded_imap(FakePool(), lambda x: x * 2,
+                                                 range(10), window):
+            # The value being consumed counts towards the window
+            self.assertLessEqual(len(outstanding) - len(results), window)
+            results.append(value)
+
+        self.assertEqual(results, [x * 2 for x in range(10)])
+
+    def test_write_dataset_shards(self):
+        """Test transitions are split into fixed-size shards"""
+        transitions = generate_transitions(greedy_autopilot, num_games=2,
+                                           width=60, height=60, block_size=10,
+                                           max_steps=25, seed=0)
+        shards = write_dataset(transitions, self.out_dir, shard_size=10)
+
+        self.assertEqual(shards, list_shards(self.out_dir))
+        sizes = [len(load_shard(prefix)["action"]) for prefix in shards]
+        self.assertTrue(all(size == 10 for size in sizes[:-1]))
+        self.assertTrue(0 < sizes[-1] <= 10)
+        self.assertEqual(load_shard(shards[0])["obs"].shape[1:], (6, 6))
+
+    def test_writer_refuses_existing_shards(self):
+        """Test writing into a directory with old shards fails instead of mixing data"""
+        rows = [(np.zeros((2, 2), dtype=np.uint8), 0, 0.0, False)] * 30
+        write_dataset(rows, self.out_dir, shard_size=10)
+
+        with self.assertRaises(FileExistsError):
+            ShardWriter(self.out_dir, shard_size=10)
+        self.assertEqual(len(list_shards(self.out_dir)), 3)
+
+    def test_aborted_write_leaves_no_complete_shards(self):
+        """Test a run that fails part way publishes nothing and can be re-run"""
+        def failing_rows():
+            for _ in range(25):
+                yield np.zeros((2, 2), dtype=np.uint8), 0, 0.0, False
+            raise RuntimeError("policy crashed")
+
+        with self.assertRaises(RuntimeError):
+            write_dataset(failing_rows(), self.out_dir, shard_size=10)
+        self.assertEqual(list_shards(self.out_dir), [])
+
+        rows = [(np.zeros((2, 2), dtype=np.uint8), 0, 0.0, False)] * 5
+        shards = write_dataset(rows, self.out_dir, shard_size=10)
+        self.assertEqual(shards, list_shards(self.out_dir))
+        self.assertEqual(len(load_shard(shards[0])["action"]), 5)
+        self.assertEqual(sorted(os.listdir(self.out_dir)),
+                         sorted(f"shard_00000_{field}.npy"
+                                for field in snake_dataset.FIELDS))
+
+    def test_iter_batches_covers_dataset(self):
+        """Test shuffled batches cover every transition exactly once"""
+        rewards = [(np.zeros((2, 2), dtype=np.uint8), 0, float(i), False)
+                   for i in range(23)]
+        write_dataset(rewards, self.out_dir, shard_size=7)
+
+        batches = list(iter_batches(self.out_dir, batch_size=5, seed=0))
+        self.assertEqual([len(b["reward"]) for b in batches], [5, 5, 5, 5, 3])
+        seen = sorted(float(r) for b in batches for r in b["reward"])
+        self.assertEqual(seen, [float(i) for i in range(23)])
+
+        dropped = list(iter_batches(self.out_dir, batch_size=5, seed=0,
+                                    drop_last=True))
+        self.assertEqual(len(dropped), 4)
+
+    def test_iter_batches_without_shuffle(self):
+        """Test unshuffled batches preserve write order"""
+        rewards = [(np.zeros((2, 2), dtype=np.uint8), 0, float(i), False)
+                   for i in range(12)]
+        write_dataset(rewards, self.out_dir, shard_size=5)
+
+        batches = list(iter_batches(self.out_dir, batch_size=4, shuffle=False))
+        order = [float(r) for b in batches for r in b["reward"]]
+        self.assertEqual(order, [float(i) for i in range(12)])
+
+
+if __name__ == '__main__':
+    unittest.main()
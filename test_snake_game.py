@@ -3,7 +3,7 @@ Unit Tests for Snake Game Logic
 """
 import unittest
 import random
-from snake_game import SnakeGame, Direction, GameState
+from snake_game import SnakeGame, Direction, GameState, is_grid_aligned
 
 
 class TestSnakeGame(unittest.TestCase):
@@ -137,6 +137,26 @@ class TestSnakeGame(unittest.TestCase):
         self.assertEqual(food_pos[1], 190)
         self.assertNotIn(food_pos, positions)
     
+    def test_food_generation_with_own_rng(self):
+        """Test a game with its own rng is reproducible and leaves global random alone"""
+        random.seed(7)
+        expected = random.random()
+
+        random.seed(7)
+        first = SnakeGame(width=200, height=200, block_size=10, rng=random.Random(3))
+        second = SnakeGame(width=200, height=200, block_size=10, rng=random.Random(3))
+
+        self.assertEqual(first.get_food_position(), second.get_food_position())
+        self.assertEqual(random.random(), expected)
+    
+    def test_grid_alignment(self):
+        """Test boards are aligned only when the start cell sits on the grid"""
+        self.assertTrue(is_grid_aligned(600, 400, 10))
+        self.assertTrue(is_grid_aligned(1920, 1080, 2))
+        self.assertFalse(is_grid_aligned(65, 40, 10))
+        self.assertFalse(is_grid_aligned(100, 100, 20))
+        self.assertFalse(is_grid_aligned(80, 60, 3))
+    
     def test_reset_game(self):
         """Test game reset functionality"""
         # Modify game state